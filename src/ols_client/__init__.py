@@ -2,19 +2,21 @@
 
 """A client to the EBI Ontology Lookup Service."""
 
-from class_resolver import ClassResolver
+from functools import lru_cache
 
 from .client import (
     Client,
     EBIClient,
     FraunhoferClient,
     MonarchClient,
+    Term,
     TIBClient,
     ZBMedClient,
 )
 
 __all__ = [
     "client_resolver",
+    "Term",
     # Base class
     "Client",
     # Concrete classes
@@ -25,4 +27,16 @@ __all__ = [
     "MonarchClient",
 ]
 
-client_resolver = ClassResolver.from_subclasses(Client)
+
+def __getattr__(name: str):
+    # the resolver is built on first access since importing class_resolver is slow
+    if name == "client_resolver":
+        return _get_client_resolver()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=1)
+def _get_client_resolver():
+    from class_resolver import ClassResolver
+
+    return ClassResolver.from_subclasses(Client)
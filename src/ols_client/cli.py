@@ -2,7 +2,7 @@
 
 """CLI for the OLS client."""
 
-import sys
+from itertools import islice
 from typing import Optional
 
 import click
@@ -17,41 +17,89 @@ def main():
 
 ontology_argument = click.argument("ontology")
 iri_option = click.option("--iri", required=True)
-output_option = click.option("-o", "--output", type=click.File("w"), default=sys.stdout)
+output_option = click.option("-o", "--output", type=click.File("w"), default="-")
 base_url_option = click.option(
     "-b", "--base-url", default="http://www.ebi.ac.uk/ols", show_default=True
 )
+limit_option = click.option(
+    "--limit", type=click.IntRange(min=0), help="Stop after this many results."
+)
+page_size_option = click.option(
+    "--page-size", type=click.IntRange(1, 500), help="The number of results per request."
+)
+cache_option = click.option(
+    "--cache/--no-cache",
+    default=False,
+    show_default=True,
+    help="Cache responses on disk. Requires requests-cache.",
+)
 
 
 def _echo_via_pager(x):
     click.echo_via_pager((term + "\n" for term in x))
 
 
+def _write_batched(x, output, batch_size: int = 500):
+    x = iter(x)
+    while True:
+        batch = list(islice(x, batch_size))
+        if not batch:
+            break
+        output.write("\n".join(batch) + "\n")
+
+
 @main.command()
 @ontology_argument
+@output_option
+@limit_option
+@page_size_option
 @base_url_option
-def labels(ontology: str, base_url: str):
+@cache_option
+def labels(
+    ontology: str,
+    output,
+    limit: Optional[int],
+    page_size: Optional[int],
+    base_url: str,
+    cache: bool,
+):
     """Output the names to the given file."""
-    client = Client(base_url)
-    _echo_via_pager(client.iter_labels(ontology))
+    client = Client(base_url, cache=cache)
+    it = islice(client.iter_labels(ontology, size=page_size), limit)
+    if output.isatty():
+        _echo_via_pager(it)
+    else:
+        _write_batched(it, output)
 
 
 @main.command()
 @ontology_argument
 @iri_option
+@limit_option
+@page_size_option
 @base_url_option
-def ancestors(ontology: str, iri: str, base_url: str):
+@cache_option
+def ancestors(
+    ontology: str,
+    iri: str,
+    limit: Optional[int],
+    page_size: Optional[int],
+    base_url: str,
+    cache: bool,
+):
     """Output the ancestors of the given term."""
-    client = Client(base_url)
-    _echo_via_pager(client.iter_ancestors_labels(ontology=ontology, iri=iri))
+    client = Client(base_url, cache=cache)
+    it = client.iter_ancestors_labels(ontology=ontology, iri=iri, size=page_size)
+    _echo_via_pager(islice(it, limit))
 
 
 @main.command()
 @click.argument("query")
 @base_url_option
-def search(query: str, base_url: str):
+@cache_option
+def search(query: str, base_url: str, cache: bool):
     """Search the OLS with the given query."""
-    client = Client(base_url)
+    client = Client(base_url, cache=cache)
     _echo_via_pager(client.search(query=query))
 
 
@@ -59,10 +107,11 @@ def search(query: str, base_url: str):
 @click.argument("query")
 @click.option("--ontology")
 @base_url_option
-def suggest(query: str, ontology: Optional[str], base_url: str):
+@cache_option
+def suggest(query: str, ontology: Optional[str], base_url: str, cache: bool):
     """Suggest a term based on th given query."""
-    client = Client(base_url)
-    click.echo_via_pager((term + "\n" for term in client.suggest(query=query, ontology=ontology)))
+    client = Client(base_url, cache=cache)
+    _echo_via_pager(client.suggest(query=query, ontology=ontology))
 
 
 if __name__ == "__main__":
@@ -2,14 +2,53 @@
 
 """Client classes for the OLS."""
 
+import atexit
 import logging
+import threading
 import time
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from functools import lru_cache
+from io import BytesIO
+from itertools import chain, islice
+from operator import itemgetter
+from pathlib import Path
+from types import MappingProxyType
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterable,
+    ClassVar,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from urllib.parse import quote
 
 import requests
+from requests import HTTPError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .version import VERSION
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 __all__ = [
+    # Data
+    "Term",
     # Base client
     "Client",
     # Concrete
@@ -22,36 +61,442 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+#: The default (connect, read) timeout in seconds for requests to the OLS
+TIMEOUT = (5, 30)
+#: How long responses are kept in the on-disk cache, unless the server says otherwise
+CACHE_EXPIRATION = timedelta(days=7)
+#: A read-only fallback for chained lookups into optional parts of a response
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+class Term(NamedTuple):
+    """A compact representation of a term, for when the full document isn't needed."""
+
+    iri: str
+    label: Optional[str] = None
+    short_form: Optional[str] = None
+    obo_id: Optional[str] = None
+    description: Optional[List[str]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Term":
+        """Get a term from the JSON returned by the OLS.
+
+        :param data: A term document from the OLS
+        :returns: A term with the fields of interest
+        """
+        return cls(
+            iri=data["iri"],
+            label=data.get("label"),
+            short_form=data.get("short_form"),
+            obo_id=data.get("obo_id"),
+            description=data.get("description"),
+        )
+
+
+class _LRUCache:
+    """A mapping that evicts the least recently used entry once it's full.
+
+    It's safe to use from several threads, like the ones looking up terms concurrently.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get the value for the key, or None if it's not cached."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        """Cache the value for the key, evicting the least recently used entry if needed."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+
+def _loads(res: requests.Response):
+    """Parse the JSON from a response, using :mod:`orjson` if it's available."""
+    if orjson is None:
+        return res.json()
+    return orjson.loads(res.content)
+
+
+async def _aget_json(session, url: str, params: Optional[Dict[str, Any]] = None):
+    """Get the response JSON with an :mod:`aiohttp` session, using :mod:`orjson` if it's available."""
+    async with session.get(url, params=params) as res:
+        if orjson is None:
+            return await res.json()
+        return orjson.loads(await res.read())
+
+
+def _get_embedded(res_json, key: Optional[str] = None):
+    """Get the embedded items from a paged response, optionally slicing by the given key."""
+    rv = res_json["_embedded"]
+    if key:
+        rv = rv[key]
+    return rv
 
-def _iterate_response_terms(response):
-    """Iterate over the terms in the given response."""
-    yield from response["_embedded"]["terms"]
 
+def _get_next_href(res_json) -> Optional[str]:
+    """Get the link to the next page from a paged response, if there is one."""
+    return res_json.get("_links", _EMPTY).get("next", _EMPTY).get("href")
 
-def _quote(iri):
-    # must be double encoded https://www.ebi.ac.uk/ols/docs/api
-    iri = quote(iri, safe="")
-    iri = quote(iri, safe="")
-    return iri
 
+def _iter_streamed_items(res: requests.Response, key: str, value_key: Optional[str] = None):
+    """Yield items from a streamed page as they are parsed, then return the link to the next page.
 
-def _help_iterate_labels(term_iterator):
-    for term in term_iterator:
-        yield term["label"]
+    Only one item is materialized at a time, rather than the whole page.
+
+    :param res: A response that was requested with ``stream=True``
+    :param key: The key to slice from the _embedded field
+    :param value_key: If given, only yield this (scalar) value from each item. This
+        skips building the items entirely.
+    :yields: Items in the page
+    :returns: The link to the next page, if there is one
+    """
+    import ijson
+
+    if getattr(res, "from_cache", False):
+        # requests-cache replays the body from a buffer that ijson's initial zero-length
+        # read empties, so parse the cached content instead
+        source: Any = BytesIO(res.content)
+    else:
+        res.raw.decode_content = True
+        source = res.raw
+    item_prefix = f"_embedded.{key}.item"
+    value_prefix = f"{item_prefix}.{value_key}" if value_key else None
+    builder = None
+    next_href = None
+    for prefix, event, value in ijson.parse(source, use_float=True):
+        if prefix == value_prefix:
+            yield value
+        elif value_prefix is not None:
+            if prefix == "_links.next.href":
+                next_href = value
+        elif builder is not None:
+            builder.event(event, value)
+            if prefix == item_prefix and event == "end_map":
+                yield builder.value
+                builder = None
+        elif prefix == item_prefix and event == "start_map":
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == "_links.next.href":
+            next_href = value
+    return next_href
+
+
+@lru_cache(maxsize=256)
+def _join_ontologies(ontologies: Tuple[str, ...]) -> str:
+    return ",".join(ontologies)
+
+
+@lru_cache(maxsize=8192)
+def _quote(iri: str) -> str:
+    # must be double encoded https://www.ebi.ac.uk/ols/docs/api. The first pass only
+    # leaves unreserved characters and percent escapes, so the second just escapes "%"
+    return quote(iri, safe="").replace("%", "%25")
+
+
+def _get_cache_path(cache: Union[bool, str, Path]) -> Optional[Path]:
+    """Get the SQLite database responses are cached in, or None if they aren't cached.
+
+    :param cache: Where responses are cached, see :func:`_get_session`
+    :returns: The absolute path to the database, with the extension :mod:`requests_cache`
+        adds if it's missing, so each database has only one path
+    """
+    if not cache:
+        return None
+    if cache is True:
+        import pystow
+
+        cache = pystow.join("ols_client", name="http.sqlite")
+    path = Path(cache).expanduser().resolve()
+    if not path.suffix:
+        path = path.with_suffix(".sqlite")
+    return path
+
+
+def _get_session(
+    cache: Union[bool, str, Path] = False,
+    cache_expire_after: Union[int, timedelta] = CACHE_EXPIRATION,
+) -> requests.Session:
+    """Get a session that reuses connections and retries on transient errors.
+
+    :param cache: If true, responses are cached on disk in the :mod:`pystow`
+        directory for ``ols_client``. If a path is given, they're cached in a SQLite
+        database there instead. This requires :mod:`requests_cache`, which can
+        be installed with ``pip install ols_client[cache]``.
+    :param cache_expire_after: How long cached responses are kept, in seconds if an
+        integer, unless the server's cache headers say otherwise
+    :returns: A session
+    """
+    session: requests.Session
+    cache_path = _get_cache_path(cache)
+    if cache_path is not None:
+        import requests_cache
+
+        session = requests_cache.CachedSession(
+            cache_name=str(cache_path),
+            backend="sqlite",
+            expire_after=cache_expire_after,
+            allowable_methods=("GET",),
+            cache_control=True,
+            stale_if_error=True,
+        )
+    else:
+        session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        # with concurrent paging the server may ask to slow down, so back off
+        # (0.5s, 1s, 2s, ...) or wait as long as its Retry-After header says
+        max_retries=Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["Accept"] = "application/json"
+    session.headers["User-Agent"] = f"ols_client/{VERSION}"
+    return session
+
+
+_SESSIONS: Dict[Tuple[str, Optional[Path], timedelta], requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _get_shared_session(
+    base_url: str,
+    cache: Union[bool, str, Path] = False,
+    cache_expire_after: Union[int, timedelta] = CACHE_EXPIRATION,
+) -> requests.Session:
+    """Get a session shared by all clients for the same server with the same cache settings.
+
+    Sessions pool connections per host, so clients created one after the other, like
+    in a test suite, reuse each other's open connections instead of reconnecting.
+
+    :param base_url: The base URL of the server the session is used for
+    :param cache: Where responses are cached, see :func:`_get_session`
+    :param cache_expire_after: How long cached responses are kept, see :func:`_get_session`
+    :returns: A session
+    """
+    if isinstance(cache_expire_after, int):
+        cache_expire_after = timedelta(seconds=cache_expire_after)
+    # the same database or expiration can be given in different ways
+    key = base_url, _get_cache_path(cache), cache_expire_after
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = _SESSIONS[key] = _get_session(
+                cache=cache, cache_expire_after=cache_expire_after
+            )
+    return session
+
+
+@atexit.register
+def _close_shared_sessions() -> None:
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
+_get_label = itemgetter("label")
+
+
+def _help_iterate_labels(pages: Iterable[List[Dict[str, Any]]]) -> Iterable[str]:
+    # only step through Python code once per page, the labels are taken in C
+    return chain.from_iterable(map(_get_label, page) for page in pages)
 
 
 class Client:
-    """Wraps the functions to query the Ontology Lookup Service such that alternative base URL's can be used."""
+    """Wraps the functions to query the Ontology Lookup Service such that alternative base URL's can be used.
 
-    def __init__(self, base_url: str):
+    Responses are always requested with compression. If a Brotli decoder is installed,
+    e.g., with ``pip install ols_client[compression]``, Brotli is also offered, which
+    shrinks the repetitive JSON returned by the OLS further than gzip.
+    """
+
+    #: The largest page size the server allows
+    MAX_PAGE_SIZE: ClassVar[int] = 500
+
+    def __init__(
+        self,
+        base_url: str,
+        session: Optional[requests.Session] = None,
+        cache: Union[bool, str, Path] = False,
+        cache_expire_after: Union[int, timedelta] = CACHE_EXPIRATION,
+        memo_size: int = 1024,
+        stream: bool = False,
+        max_requests: int = 16,
+    ):
         """Initialize the client.
 
         :param base_url: An optional, custom URL for the OLS API.
+        :param session: A pre-configured session. If not given, one that keeps
+            connections alive between requests and retries on transient errors is
+            shared with the other clients for the same server that have the same
+            cache settings. Changes to :attr:`Client.session`, like its headers or
+            authentication, then also apply to those clients.
+        :param cache: If true and no session is given, cache responses on disk.
+            Ontologies are released infrequently, so this avoids downloading the
+            same pages on repeat runs. A path to a SQLite database can be given
+            to choose where the cache is kept. All GETs go through the same session,
+            so this includes the children looked up by :meth:`Client.iter_hierarchy`.
+        :param cache_expire_after: How long cached responses are kept, in seconds if an
+            integer, unless the server's cache headers say otherwise. Defaults to a week.
+        :param memo_size: The number of ontologies and of terms whose metadata are
+            memoized on the client, see :meth:`Client.cache_clear`.
+        :param stream: If true, paged requests parse each page incrementally by default,
+            so the first items are available before the whole page has downloaded and
+            only one is held in memory at a time. See :meth:`Client.get_paged`.
+        :param max_requests: The maximum number of requests the client has in flight
+            at the same time across all of its threads, so concurrent paging and
+            lookups stay within the server's rate limits. A streamed page only counts
+            until its headers arrive, since its body is read while the caller consumes
+            the items. Holding it any longer could deadlock callers that make other
+            requests in the meantime.
         """
         base_url = base_url.rstrip("/")
         if not base_url.endswith("/api"):
             base_url = f"{base_url}/api"
         self.base_url = base_url
+        self._ontology_url = f"{base_url}/ontologies/{{}}"
+        self._terms_url = f"{self._ontology_url}/terms"
+        self._ancestors_url = f"{self._terms_url}/{{}}/ancestors"
+        self._hierarchical_ancestors_url = f"{self._terms_url}/{{}}/hierarchicalAncestors"
+        #: Whether the server supports the ``fields`` parameter. None if not yet probed.
+        self._supports_fields: Optional[bool] = None
+        self._ontology_cache = _LRUCache(memo_size)
+        self._term_cache = _LRUCache(memo_size)
+        if session is None:
+            session = _get_shared_session(
+                self.base_url, cache=cache, cache_expire_after=cache_expire_after
+            )
+        self.session = session
+        self.stream = stream
+        self._semaphore = threading.BoundedSemaphore(max_requests)
+        # the aiohttp session opened by ``async with client``, see Client._aiohttp_session_context
+        self._aiohttp_session: Any = None
+        self._aiohttp_loop: Any = None
+
+    @classmethod
+    def _normalize_size(cls, size: Optional[int]) -> int:
+        """Get the page size to request, defaulting to the largest one allowed.
+
+        :param size: The requested page size
+        :returns: The page size to use
+        :raises ValueError: if the size is larger than allowed
+        """
+        if size is None:
+            return cls.MAX_PAGE_SIZE
+        if size > cls.MAX_PAGE_SIZE:
+            raise ValueError(f"Maximum size is {cls.MAX_PAGE_SIZE}. Given: {size}")
+        return size
+
+    def close(self) -> None:
+        """Close the connections kept open by the client's session.
+
+        The session can still be used afterwards, and reconnects when needed. This
+        means closing a client doesn't break others that share its session.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        """Use the client as a context manager that closes its session on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the client's session."""
+        self.close()
+
+    @staticmethod
+    def _new_aiohttp_session():
+        import aiohttp
+
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(sock_connect=TIMEOUT[0], sock_read=TIMEOUT[1]),
+            headers={"Accept": "application/json", "User-Agent": f"ols_client/{VERSION}"},
+            raise_for_status=True,
+        )
+
+    @asynccontextmanager
+    async def _aiohttp_session_context(self):
+        """Use the session opened by ``async with client`` or, outside of one, a temporary session."""
+        import asyncio
+
+        # sessions are bound to the event loop they were made in, so one opened
+        # on another loop can't be borrowed
+        if self._aiohttp_session is not None and self._aiohttp_loop is asyncio.get_running_loop():
+            yield self._aiohttp_session
+            return
+        session = self._new_aiohttp_session()
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    async def aclose(self) -> None:
+        """Close the :mod:`aiohttp` session opened by ``async with client``, if any."""
+        if self._aiohttp_session is not None:
+            session = self._aiohttp_session
+            self._aiohttp_session = None
+            self._aiohttp_loop = None
+            await session.close()
+
+    async def __aenter__(self):
+        """Use the client as an asynchronous context manager that shares one session until exit."""
+        import asyncio
+
+        if self._aiohttp_session is None:
+            self._aiohttp_session = self._new_aiohttp_session()
+            self._aiohttp_loop = asyncio.get_running_loop()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Close the client's sessions."""
+        await self.aclose()
+        self.close()
+
+    def _get_url(self, path: str) -> str:
+        if path.startswith(self.base_url):
+            if path[len(self.base_url) : len(self.base_url) + 1] == "/":
+                return path
+            path = path[len(self.base_url) :]
+        return self.base_url + "/" + path.lstrip("/")
+
+    def _request(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request to the URL, waiting while too many are in flight.
+
+        With ``stream=True``, this returns once the headers arrive, so the body isn't
+        counted against the client's ``max_requests``.
+
+        :param url: The URL to request
+        :param kwargs: Keyword arguments to pass through to :meth:`requests.Session.get`
+        :returns: The response
+        """
+        kwargs.setdefault("timeout", TIMEOUT)
+        with self._semaphore:
+            return self.session.get(url, **kwargs)
 
     def get_json(
         self,
@@ -61,9 +506,24 @@ class Client:
         **kwargs,
     ):
         """Get the response JSON."""
-        return self.get_response(
-            path=path, params=params, raise_for_status=raise_for_status, **kwargs
-        ).json()
+        return _loads(
+            self.get_response(path=path, params=params, raise_for_status=raise_for_status, **kwargs)
+        )
+
+    async def aget_json(self, path: str, params: Optional[Dict[str, Any]] = None):
+        """Get the response JSON asynchronously.
+
+        Inside ``async with client``, concurrent calls share the connections of one
+        :mod:`aiohttp` session. Otherwise, each call opens and closes its own.
+
+        .. note:: This requires :mod:`aiohttp`, which can be installed with ``pip install ols_client[async]``
+
+        :param path: The path to query following the base URL, e.g., ``/ontologies``.
+        :param params: Parameters to pass through to :meth:`aiohttp.ClientSession.get`
+        :returns: The response JSON
+        """
+        async with self._aiohttp_session_context() as session:
+            return await _aget_json(session, self._get_url(path), params=params)
 
     def get_response(
         self,
@@ -76,17 +536,14 @@ class Client:
 
         :param path: The path to query following the base URL, e.g., ``/ontologies``.
             If this starts with the base URL, it gets stripped.
-        :param params: Parameters to pass through to :func:`requests.get`
+        :param params: Parameters to pass through to :func:`requests.Session.get`
         :param raise_for_status: If true and the status code isn't 200, raise an exception
-        :param kwargs: Keyword arguments to pass through to :func:`requests.get`
-        :returns: The response from :func:`requests.get`
+        :param kwargs: Keyword arguments to pass through to :func:`requests.Session.get`
+        :returns: The response from :func:`requests.Session.get`
         """
         if not params:
             params = {}
-        if path.startswith(self.base_url):
-            path = path[len(self.base_url) :]
-        url = self.base_url + "/" + path.lstrip("/")
-        res = requests.get(url, params=params, **kwargs)
+        res = self._request(self._get_url(path), params=params, **kwargs)
         if raise_for_status:
             res.raise_for_status()
         return res
@@ -97,6 +554,9 @@ class Client:
         key: Optional[str] = None,
         size: Optional[int] = None,
         sleep: Optional[int] = None,
+        stream: Optional[bool] = None,
+        workers: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
     ) -> Iterable:
         """Iterate over all terms, lazily with paging.
 
@@ -104,50 +564,381 @@ class Client:
         :param key: The key to slice from the _embedded field
         :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
         :param sleep: The amount of time to sleep between pages. Defaults to none.
+        :param stream: If true, parse each page incrementally so only one item is held
+            in memory at a time. This requires :mod:`ijson`, which can be installed with
+            ``pip install ols_client[stream]``. Defaults to the client's setting, which
+            only applies when a key is given.
+        :param workers: The number of threads requesting the pages following the first, up
+            to this many pages ahead of the one being consumed. Defaults to one, so the
+            next page is downloaded while the current one is consumed. Ignored when
+            sleeping between pages or streaming.
+        :param fields: If given, ask the server to only return these fields for each item.
+            Servers that don't support this return the full items.
         :yields: A terms in an ontology
-        :raises ValueError: if an invalid size is given
+        :raises ValueError: if the size is larger than allowed, or if streaming without a key
         """
-        if size is None:
-            size = 500
-        elif size > 500:
-            raise ValueError(f"Maximum size is 500. Given: {size}")
-
-        res_json = self.get_json(path, params={"size": size})
-        yv = res_json["_embedded"]
-        if key:
-            yv = yv[key]
-        yield from yv
-        next_href = (res_json.get("_links") or {}).get("href")
+        size = self._normalize_size(size)
+
+        if stream is None:
+            stream = self.stream and bool(key)
+        if stream:
+            if not key:
+                raise ValueError("A key is required to stream pages")
+            yield from self._iter_streamed(path, key=key, size=size, sleep=sleep, fields=fields)
+        else:
+            for page in self._iter_pages(
+                path, key=key, size=size, sleep=sleep, workers=workers, fields=fields
+            ):
+                yield from page
+
+    def _iter_pages(
+        self,
+        path: str,
+        key: Optional[str],
+        size: int,
+        sleep: Optional[int] = None,
+        workers: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterable[List]:
+        """Iterate over the items in each page, one list per page."""
+        params: Dict[str, Any] = {"size": size}
+        if fields:
+            params["fields"] = ",".join(fields)
+        res_json = self.get_json(path, params=params)
+        yield _get_embedded(res_json, key)
+        # the first page says how many there are, so the rest can be requested by number
+        # (zero-indexed) instead of waiting for each page to link to the next
+        total = res_json.get("page", _EMPTY).get("totalPages")
+        if total is None:
+            # without the number of pages, follow the links from page to page like
+            # when streaming instead of stopping after the first one
+            next_href = _get_next_href(res_json)
+            while next_href:
+                if sleep is not None:
+                    time.sleep(sleep)
+                res = self._request(next_href)
+                res.raise_for_status()
+                res_json = _loads(res)
+                yield _get_embedded(res_json, key)
+                next_href = _get_next_href(res_json)
+            return
+        if total <= 1:
+            return
+        # at least the next page is always in flight while the current one is consumed
+        if workers is None or sleep is not None:
+            workers = 1
+        pages = iter(range(1, total))
+        futures: Deque[Future] = deque()
+        get_json = self.get_json
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            submit = executor.submit
+
+            def _submit() -> None:
+                for page in islice(pages, workers - len(futures)):
+                    if sleep is not None:
+                        time.sleep(sleep)
+                    futures.append(submit(get_json, path, params={**params, "page": page}))
+
+            _submit()
+            try:
+                while futures:
+                    loop_res_json = futures.popleft().result()
+                    _submit()
+                    yield _get_embedded(loop_res_json, key)
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _iter_streamed(
+        self,
+        path: str,
+        key: str,
+        size: int,
+        sleep: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+        value_key: Optional[str] = None,
+    ) -> Iterable:
+        """Iterate over the items in each page, parsing them incrementally."""
+        params: Dict[str, Any] = {"size": size}
+        if fields:
+            params["fields"] = ",".join(fields)
+        with self.get_response(path, params=params, stream=True) as res:
+            next_href = yield from _iter_streamed_items(res, key, value_key=value_key)
         while next_href:
             if sleep is not None:
                 time.sleep(sleep)
-            loop_res_json = requests.get(next_href).json()
-            yv = loop_res_json["_embedded"]
-            if key:
-                yv = yv[key]
-            yield from yv
-            next_href = (loop_res_json.get("_links") or {}).get("href")
+            with self._request(next_href, stream=True) as res:
+                res.raise_for_status()
+                next_href = yield from _iter_streamed_items(res, key, value_key=value_key)
+
+    async def aget_paged(
+        self,
+        path: str,
+        key: Optional[str] = None,
+        size: Optional[int] = None,
+        concurrency: int = 8,
+        fields: Optional[Iterable[str]] = None,
+    ) -> AsyncGenerator[Any, None]:
+        """Iterate over all items asynchronously, fetching upcoming pages concurrently.
+
+        Once the first page reports the total number of pages, up to ``concurrency``
+        of the following pages are requested while the current one is consumed.
+
+        .. note:: This requires :mod:`aiohttp`, which can be installed with ``pip install ols_client[async]``
+
+        :param path: The url to query
+        :param key: The key to slice from the _embedded field
+        :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
+        :param concurrency: The maximum number of pages requested at the same time. This
+            is capped by the 32 connections of the :mod:`aiohttp` session, which is
+            the one opened by ``async with client`` or else one kept open while paging.
+        :param fields: If given, ask the server to only return these fields for each item.
+            Servers that don't support this return the full items.
+        :yields: Items from each page, in order
+        """
+        import asyncio
+
+        params: Dict[str, Any] = {"size": self._normalize_size(size)}
+        if fields:
+            params["fields"] = ",".join(fields)
+        url = self._get_url(path)
+
+        async with self._aiohttp_session_context() as session:
+
+            def _get_page(page: int):
+                return asyncio.ensure_future(
+                    _aget_json(session, url, params={**params, "page": page})
+                )
+
+            res_json = await _aget_json(session, url, params=params)
+            total = res_json.get("page", _EMPTY).get("totalPages")
+            if total is None:
+                # without the number of pages, follow the links from page to page
+                while True:
+                    for item in _get_embedded(res_json, key):
+                        yield item
+                    next_href = _get_next_href(res_json)
+                    if not next_href:
+                        return
+                    res_json = await _aget_json(session, next_href)
+            next_page = min(total, concurrency + 1)
+            pending: Deque[asyncio.Future] = deque(_get_page(page) for page in range(1, next_page))
+            try:
+                while True:
+                    for item in _get_embedded(res_json, key):
+                        yield item
+                    if not pending:
+                        break
+                    res_json = await pending.popleft()
+                    if next_page < total:
+                        pending.append(_get_page(next_page))
+                        next_page += 1
+            finally:
+                for future in pending:
+                    future.cancel()
+                # let the cancelled requests finish before their session can be closed
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def iter_paged_concurrent(
+        self,
+        path: str,
+        key: Optional[str] = None,
+        size: Optional[int] = None,
+        concurrency: int = 8,
+    ) -> Iterable:
+        """Iterate over all items, fetching upcoming pages concurrently with :meth:`Client.aget_paged`.
+
+        This drives the asynchronous pager on a private event loop, so it can't be used
+        from code that is already running in an event loop. Use :meth:`Client.aget_paged`
+        directly there instead.
+
+        :param path: The url to query
+        :param key: The key to slice from the _embedded field
+        :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
+        :param concurrency: The maximum number of pages requested at the same time
+        :yields: Items from each page, in order
+        """
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        items = self.aget_paged(path, key=key, size=size, concurrency=concurrency)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(items.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            # this also closes the pager's session, which belongs to this loop
+            loop.run_until_complete(items.aclose())
+            loop.close()
+
+    def _iter_pages_projected(
+        self,
+        path: str,
+        key: str,
+        fields: Sequence[str],
+        size: Optional[int] = None,
+        sleep: Optional[int] = None,
+        workers: Optional[int] = None,
+        stream: bool = False,
+    ) -> Iterable[List]:
+        """Iterate over the items in each page, only requesting the given fields if the server supports it.
+
+        Support is probed with the first request and remembered for the client, so servers
+        that reject the ``fields`` parameter or leave out the requested fields only cost one
+        extra request.
+
+        :param path: The url to query
+        :param key: The key to slice from the _embedded field
+        :param fields: The fields to request for each item
+        :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
+        :param sleep: The amount of time to sleep between pages. Defaults to 0 seconds.
+        :param workers: The number of threads requesting the pages following the first,
+            see :meth:`Client.get_paged`
+        :param stream: If true, parse each page incrementally and yield one list per item,
+            see :meth:`Client.get_paged`
+        :yields: The items in each page, possibly only with the given fields
+        :raises HTTPError: if the first request fails for a reason other than the parameter
+        """
+        size = self._normalize_size(size)
+
+        def _get_pages(fields_: Optional[Sequence[str]] = None) -> Iterable[List]:
+            if stream:
+                items = self._iter_streamed(path, key=key, size=size, sleep=sleep, fields=fields_)
+                return ([item] for item in items)
+            return self._iter_pages(
+                path, key=key, size=size, sleep=sleep, workers=workers, fields=fields_
+            )
+
+        if self._supports_fields is not False:
+            pages = iter(_get_pages(fields))
+            try:
+                first = next(pages, None)
+            except HTTPError as e:
+                if e.response is None or e.response.status_code != 400:
+                    raise
+                self._supports_fields = False
+            else:
+                if not first:
+                    return
+                # not every item has every field, e.g., a description, so only
+                # fall back if the server dropped all of them
+                if any(field in first[0] for field in fields):
+                    self._supports_fields = True
+                    yield first
+                    yield from pages
+                    return
+                self._supports_fields = False
+        yield from _get_pages()
+
+    def _get_paged_projected(
+        self, path: str, key: str, fields: Sequence[str], stream: Optional[bool] = None, **kwargs
+    ) -> Iterable:
+        """Iterate over all items, only requesting the given fields if the server supports it.
+
+        :param path: The url to query
+        :param key: The key to slice from the _embedded field
+        :param fields: The fields to request for each item
+        :param stream: If true, parse each page incrementally. Defaults to the client's setting.
+        :param kwargs: Keyword arguments to pass through to :meth:`Client._iter_pages_projected`
+        :yields: Items, possibly only with the given fields
+        """
+        if stream is None:
+            stream = self.stream
+        yield from chain.from_iterable(
+            self._iter_pages_projected(path, key=key, fields=fields, stream=stream, **kwargs)
+        )
+
+    def cache_clear(self) -> None:
+        """Clear the ontology and term metadata memoized on the client."""
+        self._ontology_cache.clear()
+        self._term_cache.clear()
 
     def get_ontologies(self):
         """Get all ontologies."""
         return self.get_paged("/ontologies", key="ontologies")
 
-    def get_ontology(self, ontology: str):
+    def get_ontology(self, ontology: str, force: bool = False):
         """Get the metadata for a given ontology.
 
+        The metadata is memoized on the client, see :meth:`Client.cache_clear`.
+
         :param ontology: The name of the ontology
+        :param force: If true, get the metadata from the server even if it's memoized
         :return: The dictionary representing the JSON from the OLS
         """
-        return self.get_json(f"/ontologies/{ontology}")
+        rv = None if force else self._ontology_cache.get(ontology)
+        if rv is None:
+            rv = self.get_json(self._ontology_url.format(ontology))
+            self._ontology_cache.set(ontology, rv)
+        return rv
 
-    def get_term(self, ontology: str, iri: str):
+    def get_term(self, ontology: str, iri: str, force: bool = False):
         """Get the data for a given term.
 
+        The data is memoized on the client, see :meth:`Client.cache_clear`.
+
         :param ontology: The name of the ontology
         :param iri: The IRI of a term
+        :param force: If true, get the data from the server even if it's memoized
         :returns: Results about the term
         """
-        return self.get_json(f"/ontologies/{ontology}/terms", params={"iri": iri})
+        rv = None if force else self._term_cache.get((ontology, iri))
+        if rv is None:
+            rv = self.get_json(self._terms_url.format(ontology), params={"iri": iri})
+            self._term_cache.set((ontology, iri), rv)
+        return rv
+
+    def get_terms(
+        self,
+        ontology: str,
+        iris: Iterable[str],
+        force: bool = False,
+        workers: int = 16,
+    ) -> Dict[str, Any]:
+        """Get the data for several terms, looking up the ones that aren't memoized concurrently.
+
+        :param ontology: The name of the ontology
+        :param iris: The IRIs of terms. Duplicates are only looked up once.
+        :param force: If true, get the data from the server even if it's memoized
+        :param workers: The number of threads looking up terms
+        :returns: A dictionary from each IRI to the results about its term, in the order given
+        """
+        rv: Dict[str, Any] = dict.fromkeys(iris)
+        if not force:
+            for iri in rv:
+                rv[iri] = self._term_cache.get((ontology, iri))
+        missing = [iri for iri, value in rv.items() if value is None]
+        if len(missing) == 1:
+            rv[missing[0]] = self.get_term(ontology, missing[0], force=True)
+        elif missing:
+            url = self._terms_url.format(ontology)
+            with ThreadPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+                # only the requests run in the threads, the memo is filled in here
+                for iri, value in zip(
+                    missing,
+                    executor.map(lambda iri: self.get_json(url, params={"iri": iri}), missing),
+                ):
+                    self._term_cache.set((ontology, iri), value)
+                    rv[iri] = value
+        return rv
+
+    async def aget_term(self, ontology: str, iri: str, force: bool = False):
+        """Get the data for a given term asynchronously.
+
+        This shares its memo with :meth:`Client.get_term`.
+
+        :param ontology: The name of the ontology
+        :param iri: The IRI of a term
+        :param force: If true, get the data from the server even if it's memoized
+        :returns: Results about the term
+        """
+        rv = None if force else self._term_cache.get((ontology, iri))
+        if rv is None:
+            rv = await self.aget_json(self._terms_url.format(ontology), params={"iri": iri})
+            self._term_cache.set((ontology, iri), rv)
+        return rv
 
     def search(self, query: str, query_fields: Optional[Iterable[str]] = None, params=None):
         """Search the OLS with the given term.
@@ -164,7 +955,24 @@ class Client:
             params["queryFields"] = ",".join(query_fields)
         return self.get_json("/search", params=params)["response"]["docs"]
 
-    def suggest(self, query: str, ontology: Union[None, str, List[str]] = None):
+    def has_label(self, ontology: str, label: str) -> bool:
+        """Check if a term in the ontology has the given label.
+
+        This takes a single search, rather than downloading every term like
+        :meth:`Client.iter_labels` does.
+
+        :param ontology: The name of the ontology
+        :param label: The label to look for
+        :returns: If a term in the ontology has exactly this label
+        """
+        docs = self.search(
+            label,
+            query_fields=["label"],
+            params={"ontology": ontology, "exact": "true", "fieldList": "label"},
+        )
+        return any(doc.get("label") == label for doc in docs)
+
+    def suggest(self, query: str, ontology: Union[None, str, Iterable[str]] = None):
         """Suggest terms from an optional list of ontologies.
 
         :param query: The query to suggest
@@ -175,22 +983,81 @@ class Client:
         """
         params = {"q": query}
         if ontology:
-            params["ontology"] = ",".join(ontology) if isinstance(ontology, list) else ontology
+            params["ontology"] = (
+                ontology if isinstance(ontology, str) else _join_ontologies(tuple(ontology))
+            )
         return self.get_json("/suggest", params=params)
 
-    def iter_terms(self, ontology: str, size: Optional[int] = None, sleep: Optional[int] = None):
+    def iter_terms(
+        self,
+        ontology: str,
+        size: Optional[int] = None,
+        sleep: Optional[int] = None,
+        stream: Optional[bool] = None,
+        workers: Optional[int] = None,
+        raw: bool = True,
+    ):
         """Iterate over all terms, lazily with paging.
 
         :param ontology: The name of the ontology
         :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
         :param sleep: The amount of time to sleep between pages. Defaults to 0 seconds.
-        :rtype: iter[dict]
+        :param stream: If true, parse terms incrementally. See :meth:`Client.get_paged`.
+        :param workers: If given, fetch pages concurrently. See :meth:`Client.get_paged`.
+        :param raw: If false, yield a compact :class:`Term` for each term instead of the
+            full document, and only request the corresponding fields from servers that
+            support it.
+        :rtype: iter[dict] | iter[Term]
         :yields: Terms in the ontology
         """
-        yield from self.get_paged(
-            f"/ontologies/{ontology}/terms", key="terms", size=size, sleep=sleep
+        path = self._terms_url.format(ontology)
+        kwargs: Dict[str, Any] = dict(size=size, sleep=sleep, stream=stream, workers=workers)
+        if raw:
+            yield from self.get_paged(path, key="terms", **kwargs)
+        else:
+            terms = self._get_paged_projected(path, key="terms", fields=Term._fields, **kwargs)
+            yield from map(Term.from_dict, terms)
+
+    def iter_terms_batched(
+        self,
+        ontology: str,
+        size: Optional[int] = None,
+        sleep: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> Iterable[List[Dict[str, Any]]]:
+        """Iterate over all terms, one page at a time.
+
+        This is useful for consumers that handle terms in bulk, like writing a page
+        of labels at once, since they don't need to handle each term in Python.
+
+        :param ontology: The name of the ontology
+        :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
+        :param sleep: The amount of time to sleep between pages. Defaults to 0 seconds.
+        :param workers: If given, fetch pages concurrently. See :meth:`Client.get_paged`.
+        :yields: Lists of terms in the ontology, one per page
+        """
+        size = self._normalize_size(size)
+        yield from self._iter_pages(
+            self._terms_url.format(ontology), key="terms", size=size, sleep=sleep, workers=workers
         )
 
+    async def aiter_terms(
+        self, ontology: str, size: Optional[int] = None, concurrency: int = 8
+    ) -> AsyncIterable[Dict[str, Any]]:
+        """Iterate over all terms asynchronously, fetching upcoming pages concurrently.
+
+        :param ontology: The name of the ontology
+        :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
+        :param concurrency: The maximum number of pages requested at the same time
+        :yields: Terms in the ontology
+
+        .. seealso:: :meth:`Client.aget_paged`
+        """
+        async for term in self.aget_paged(
+            self._terms_url.format(ontology), key="terms", size=size, concurrency=concurrency
+        ):
+            yield term
+
     def iter_ancestors(
         self,
         ontology: str,
@@ -208,7 +1075,7 @@ class Client:
         :yields: the descendants of the given term
         """
         yield from self.get_paged(
-            f"ontologies/{ontology}/terms/{_quote(iri)}/ancestors",
+            self._ancestors_url.format(ontology, _quote(iri)),
             key="terms",
             size=size,
             sleep=sleep,
@@ -231,7 +1098,7 @@ class Client:
         :yields: the descendants of the given term
         """
         yield from self.get_paged(
-            f"ontologies/{ontology}/terms/{_quote(iri)}/hierarchicalAncestors",
+            self._hierarchical_ancestors_url.format(ontology, _quote(iri)),
             key="terms",
             size=size,
             sleep=sleep,
@@ -248,48 +1115,136 @@ class Client:
         :param sleep: The amount of time to sleep between pages. Defaults to 0 seconds.
         :yields: labels of the descendants of the given term
         """
-        yield from _help_iterate_labels(self.iter_ancestors(ontology, iri, size=size, sleep=sleep))
+        yield from _help_iterate_labels(
+            self._iter_pages_projected(
+                self._ancestors_url.format(ontology, _quote(iri)),
+                key="terms",
+                fields=("iri", "label"),
+                size=size,
+                sleep=sleep,
+            )
+        )
 
     def iter_labels(
-        self, ontology: str, size: Optional[int] = None, sleep: Optional[int] = None
+        self,
+        ontology: str,
+        size: Optional[int] = None,
+        sleep: Optional[int] = None,
+        stream: Optional[bool] = None,
     ) -> Iterable[str]:
         """Iterate over the labels of terms in the ontology. Automatically wraps the pager returned by the OLS.
 
+        Only the IRI and label of each term are requested from servers that support
+        it, which is much smaller than the full term documents.
+
         :param ontology: The name of the ontology
         :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
         :param sleep: The amount of time to sleep between pages. Defaults to 0 seconds.
+        :param stream: If true, parse labels incrementally without building the
+            terms. Defaults to the client's setting. See :meth:`Client.get_paged`.
         :yields: labels of terms in the ontology
         """
-        yield from _help_iterate_labels(self.iter_terms(ontology=ontology, size=size, sleep=sleep))
+        if stream is None:
+            stream = self.stream
+        if stream:
+            size = self._normalize_size(size)
+            yield from self._iter_streamed(
+                self._terms_url.format(ontology),
+                key="terms",
+                size=size,
+                sleep=sleep,
+                fields=("iri", "label") if self._supports_fields else None,
+                value_key="label",
+            )
+            return
+        yield from _help_iterate_labels(
+            self._iter_pages_projected(
+                self._terms_url.format(ontology),
+                key="terms",
+                fields=("iri", "label"),
+                size=size,
+                sleep=sleep,
+            )
+        )
+
+    async def aiter_labels(
+        self, ontology: str, size: Optional[int] = None, concurrency: int = 8
+    ) -> AsyncIterable[str]:
+        """Iterate over the labels of terms in the ontology asynchronously, fetching upcoming pages concurrently.
+
+        :param ontology: The name of the ontology
+        :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
+        :param concurrency: The maximum number of pages requested at the same time
+        :yields: labels of terms in the ontology
+
+        .. seealso:: :meth:`Client.aget_paged`
+        """
+        async for term in self.aget_paged(
+            self._terms_url.format(ontology),
+            key="terms",
+            size=size,
+            concurrency=concurrency,
+            # only project once a synchronous request has shown the server supports it
+            fields=("iri", "label") if self._supports_fields else None,
+        ):
+            yield term["label"]
 
     def iter_hierarchy(
-        self, ontology: str, size: Optional[int] = None, sleep: Optional[int] = None
+        self,
+        ontology: str,
+        size: Optional[int] = None,
+        sleep: Optional[int] = None,
+        workers: int = 8,
     ) -> Iterable[Tuple[str, str]]:
         """Iterate over parent-child relation labels.
 
         :param ontology: The name of the ontology
         :param size: The size of each page. Defaults to 500, which is the maximum allowed by the EBI.
         :param sleep: The amount of time to sleep between pages. Defaults to 0 seconds.
+        :param workers: The number of threads looking up the children of terms. Up to
+            four times this many lookups are in flight ahead of the term being yielded.
         :yields: pairs of parent/child labels
         """
-        for term in self.iter_terms(ontology=ontology, size=size, sleep=sleep):
-            try:
-                hierarchy_children_link = term["_links"]["hierarchicalChildren"]["href"]
-            except KeyError:  # there's no children for this one
-                continue
+        request = self._request
 
-            response = requests.get(hierarchy_children_link).json()
+        def _get_children(hierarchy_children_link: str):
+            return _loads(request(hierarchy_children_link))
 
-            for child_term in response["_embedded"]["terms"]:
-                yield term["label"], child_term["label"]  # TODO handle different relation types
+        futures: Deque[Tuple[str, Future]] = deque()
+        popleft, append = futures.popleft, futures.append
 
-    def get_description(self, ontology: str) -> Optional[str]:
+        def _yield_oldest():
+            label, future = popleft()
+            for child_term in future.result()["_embedded"]["terms"]:
+                yield label, child_term["label"]  # TODO handle different relation types
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            submit = executor.submit
+            try:
+                for term in self.iter_terms(ontology=ontology, size=size, sleep=sleep):
+                    # most terms are leaves, so check for the link rather than catching a KeyError
+                    hierarchy_children_link = (
+                        term.get("_links", _EMPTY).get("hierarchicalChildren", _EMPTY).get("href")
+                    )
+                    if hierarchy_children_link is None:
+                        continue
+                    append((term["label"], submit(_get_children, hierarchy_children_link)))
+                    if len(futures) >= 4 * workers:
+                        yield from _yield_oldest()
+                while futures:
+                    yield from _yield_oldest()
+            finally:
+                for _, future in futures:
+                    future.cancel()
+
+    def get_description(self, ontology: str, force: bool = False) -> Optional[str]:
         """Get the description of a given ontology.
 
         :param ontology: The name of the ontology
+        :param force: If true, get the metadata from the server even if it's memoized
         :returns: The description of the ontology.
         """
-        response = self.get_ontology(ontology)
+        response = self.get_ontology(ontology, force=force)
         return response["config"].get("description")
 
 
@@ -299,9 +1254,9 @@ class EBIClient(Client):
     .. seealso:: https://www.ebi.ac.uk/ols4
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """Initialize the client."""
-        super().__init__(base_url="https://www.ebi.ac.uk/ols4")
+        super().__init__(base_url="https://www.ebi.ac.uk/ols4", **kwargs)
 
 
 class TIBClient(Client):
@@ -315,9 +1270,9 @@ class TIBClient(Client):
     .. seealso:: https://service.tib.eu/ts4tib/
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """Initialize the client."""
-        super().__init__(base_url="https://service.tib.eu/ts4tib")
+        super().__init__(base_url="https://service.tib.eu/ts4tib", **kwargs)
 
 
 class ZBMedClient(Client):
@@ -326,9 +1281,9 @@ class ZBMedClient(Client):
     .. seealso:: https://semanticlookup.zbmed.de/ols
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """Initialize the client."""
-        super().__init__(base_url="https://semanticlookup.zbmed.de/ols")
+        super().__init__(base_url="https://semanticlookup.zbmed.de/ols", **kwargs)
 
 
 class MonarchClient(Client):
@@ -337,9 +1292,9 @@ class MonarchClient(Client):
     .. seealso:: https://ols.monarchinitiative.org/
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """Initialize the client."""
-        super().__init__(base_url="https://ols.monarchinitiative.org/")
+        super().__init__(base_url="https://ols.monarchinitiative.org/", **kwargs)
 
 
 class FraunhoferClient(Client):
@@ -350,6 +1305,6 @@ class FraunhoferClient(Client):
     .. seealso:: https://rohan.scai.fraunhofer.de
     """
 
-    def __init__(self):
+    def __init__(self, **kwargs):
         """Initialize the client."""
-        super().__init__(base_url="https://rohan.scai.fraunhofer.de")
+        super().__init__(base_url="https://rohan.scai.fraunhofer.de", **kwargs)
@@ -2,7 +2,10 @@
 
 """Tests for the client."""
 
+import os
 import unittest
+from datetime import timedelta
+from pathlib import Path
 from typing import ClassVar, Type
 
 from ols_client.client import Client
@@ -11,19 +14,47 @@ __all__ = [
     "TestClient",
 ]
 
+#: Responses are cached here between test runs. Set OLS_REFRESH to download them again.
+CACHE_PATH = Path(__file__).parent.joinpath(".cache", "http.sqlite")
+
 
 class TestClient(unittest.TestCase):
     """Test the OLS client."""
 
     client_cls: ClassVar[Type[Client]]
+    client: ClassVar[Client]
     test_ontology: ClassVar[str]
     test_label: ClassVar[str]
 
-    def setUp(self) -> None:
-        """Set up the test case."""
-        self.client = self.client_cls()
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Set up one client for all tests in the case, so they share its connections."""
+        CACHE_PATH.parent.mkdir(exist_ok=True)
+        cls.client = cls.client_cls(cache=CACHE_PATH, cache_expire_after=timedelta(days=1))
+        if os.getenv("OLS_REFRESH"):
+            cls.client.session.cache.clear()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Close the client."""
+        cls.client.close()
 
     def test_iter_labels(self):
-        """Test getting labels."""
+        """Test getting labels, stopping once the expected one is found."""
+        self.assertTrue(
+            any(label == self.test_label for label in self.client.iter_labels(self.test_ontology)),
+            msg=f"{self.test_label!r} not found",
+        )
+
+    def test_has_label(self):
+        """Test checking for a label with a search."""
+        self.assertTrue(self.client.has_label(self.test_ontology, self.test_label))
+        self.assertFalse(self.client.has_label(self.test_ontology, f"not {self.test_label}"))
+
+    @unittest.skipUnless(
+        os.getenv("OLS_FULL_TESTS"), "set OLS_FULL_TESTS to iterate whole ontologies"
+    )
+    def test_iter_labels_full(self):
+        """Test getting all labels."""
         labels = set(self.client.iter_labels(self.test_ontology))
         self.assertIn(self.test_label, labels)
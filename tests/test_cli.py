@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the command line interface."""
+
+import unittest
+
+from click.testing import CliRunner
+
+from ols_client.cli import main
+
+
+class TestCLI(unittest.TestCase):
+    """Test the command line interface."""
+
+    def test_invalid_numbers(self):
+        """Test negative limits and out of range page sizes are usage errors."""
+        runner = CliRunner()
+        for option, value in (("--limit", "-1"), ("--page-size", "0"), ("--page-size", "501")):
+            with self.subTest(option=option, value=value):
+                result = runner.invoke(main, ["labels", "foo", option, value])
+                self.assertEqual(2, result.exit_code, msg=result.output)
+                self.assertIn(f"Invalid value for '{option}'", result.output)
@@ -0,0 +1,511 @@
+# -*- coding: utf-8 -*-
+
+"""Offline tests for the client."""
+
+import asyncio
+import gc
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from itertools import product
+from pathlib import Path
+from typing import Any, ClassVar, Dict, List, Tuple
+from unittest import mock
+from urllib.parse import parse_qs, quote, urlencode, urlsplit
+
+import requests
+
+from ols_client.client import Client, Term, _LRUCache, _quote
+
+BASE_URL = "https://example.org/ols/api"
+#: Links to the hierarchical children of each term but the last, which is a leaf
+CHILDREN_LINKS = [f"{BASE_URL}/ontologies/foo/terms/T_{i}/hierarchicalChildren" for i in range(4)]
+TERMS: List[Dict[str, Any]] = [
+    {
+        "iri": f"http://example.org/T_{i}",
+        "label": f"term {i}",
+        "_links": {"hierarchicalChildren": {"href": link}},
+    }
+    for i, link in enumerate(CHILDREN_LINKS)
+]
+TERMS.append({"iri": "http://example.org/T_4", "label": "term 4"})
+
+
+class FakeOLS:
+    """A fake OLS that serves the terms of the ``foo`` ontology by page number."""
+
+    def __init__(self, base_url: str):
+        """Initialize the fake for the given base URL."""
+        self.base_url = base_url
+        #: How the ``fields`` parameter is handled. Either "project" to only return the
+        #: given fields, "reject" to answer with a 400, or "drop" to leave them out.
+        self.fields = "project"
+        #: Whether pages say how many there are, otherwise they only link to the next
+        self.page_info = True
+        #: How long to wait before answering with the pages after the first
+        self.delay = 0.0
+        #: The URLs that were requested, in order
+        self.requested: List[str] = []
+
+    def respond(self, url: str) -> Tuple[int, bytes]:
+        """Get the status and body for the URL."""
+        self.requested.append(url)
+        parts = urlsplit(url)
+        path = parts.path[len(urlsplit(self.base_url).path) :]
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        if path.endswith("/hierarchicalChildren"):
+            # each term's children are the two terms following it
+            i = int(path.split("/")[-2][len("T_") :])
+            return 200, json.dumps({"_embedded": {"terms": TERMS[i + 1 : i + 3]}}).encode("utf-8")
+        if path != "/ontologies/foo/terms":
+            return 404, b"{}"
+        if "iri" in query:
+            terms = [term for term in TERMS if term["iri"] == query["iri"]]
+            return 200, json.dumps({"_embedded": {"terms": terms}}).encode("utf-8")
+        fields = query.get("fields", "").split(",") if "fields" in query else None
+        if fields and self.fields == "reject":
+            return 400, b"{}"
+        size, page = int(query["size"]), int(query.get("page", 0))
+        if page and self.delay:
+            time.sleep(self.delay)
+        total = -(-len(TERMS) // size)
+        terms = TERMS[page * size : (page + 1) * size]
+        if fields:
+            keep = self.fields == "project"
+            terms = [{k: v for k, v in term.items() if (k in fields) == keep} for term in terms]
+        res_json = {
+            "_embedded": {"terms": terms},
+            "page": {"size": size, "number": page, "totalPages": total},
+            "_links": {},
+        }
+        if not self.page_info:
+            del res_json["page"]
+        if page + 1 < total:
+            next_query = urlencode({**query, "page": page + 1})
+            res_json["_links"]["next"] = {"href": f"{self.base_url}{path}?{next_query}"}
+        return 200, json.dumps(res_json).encode("utf-8")
+
+    def get(self, url, params=None, **_kwargs) -> requests.Response:
+        """Answer a call to :meth:`requests.Session.get`."""
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        status, body = self.respond(url)
+        res = requests.Response()
+        res.status_code = status
+        res.url = url
+        res._content = body
+        res.raw = BytesIO(body)
+        return res
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # clients hang up on purpose, e.g., once pending pages are cancelled
+        pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa:N802
+        status, body = self.server.fake.respond(self.path)  # type: ignore
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServerTestCase(unittest.TestCase):
+    """A test case with a fake OLS served locally."""
+
+    server: ClassVar[_Server]
+    base_url: ClassVar[str]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Start the server."""
+        cls.server = _Server(("127.0.0.1", 0), _Handler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}/api"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Stop the server."""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        """Serve a new fake for each test."""
+        self.fake = self.server.fake = FakeOLS(self.base_url)  # type: ignore
+
+
+class TestPaging(unittest.TestCase):
+    """Test paging without connecting to a server."""
+
+    def setUp(self) -> None:
+        """Set up the test case with a session that serves the mock terms."""
+        self.fake = FakeOLS(BASE_URL)
+        session = mock.Mock(spec=requests.Session)
+        session.get.side_effect = self.fake.get
+        self.client = Client(BASE_URL, session=session)
+
+    def test_get_paged(self):
+        """Test all pages are requested once each and their items are yielded in order."""
+        for workers in (None, 2):
+            with self.subTest(workers=workers):
+                self.client.session.get.reset_mock()
+                terms = list(
+                    self.client.get_paged(
+                        "/ontologies/foo/terms", key="terms", size=3, workers=workers
+                    )
+                )
+                self.assertEqual(TERMS, terms)
+                pages = sorted(
+                    call[1]["params"].get("page", 0)
+                    for call in self.client.session.get.call_args_list
+                )
+                self.assertEqual([0, 1], pages)
+
+    def test_get_paged_links(self):
+        """Test the links to following pages are followed when pages don't say how many there are."""
+        self.fake.page_info = False
+        for stream in (False, True):
+            with self.subTest(stream=stream):
+                self.fake.requested.clear()
+                terms = self.client.get_paged(
+                    "/ontologies/foo/terms", key="terms", size=2, stream=stream
+                )
+                self.assertEqual(TERMS, list(terms))
+                self.assertEqual([0, 1, 2], self._get_pages_requested())
+
+    def test_get_paged_stream(self):
+        """Test streamed items are built whole and the links to following pages are followed."""
+        terms = list(
+            self.client.get_paged("/ontologies/foo/terms", key="terms", size=2, stream=True)
+        )
+        self.assertEqual(TERMS, terms)
+        self.assertEqual([0, 1, 2], self._get_pages_requested())
+
+    def test_iter_labels_stream(self):
+        """Test streamed labels are taken directly from each item."""
+        labels = list(self.client.iter_labels("foo", size=2, stream=True))
+        self.assertEqual([term["label"] for term in TERMS], labels)
+        self.assertEqual([0, 1, 2], self._get_pages_requested())
+
+    def _get_pages_requested(self) -> List[int]:
+        return [
+            int(parse_qs(urlsplit(url).query).get("page", ["0"])[0]) for url in self.fake.requested
+        ]
+
+    def _assert_labels_with_fields(self, *expected: bool) -> None:
+        """Get the labels, checking which requests asked for only some fields."""
+        self.fake.requested.clear()
+        self.assertEqual([term["label"] for term in TERMS], list(self.client.iter_labels("foo")))
+        self.assertEqual(list(expected), ["fields=" in url for url in self.fake.requested])
+
+    def test_fields_projected(self):
+        """Test only the needed fields are requested from servers that support it."""
+        self._assert_labels_with_fields(True)
+        self.assertTrue(self.client._supports_fields)
+        self._assert_labels_with_fields(True)
+
+    def test_fields_rejected(self):
+        """Test falling back to full terms when the server rejects the fields parameter."""
+        self.fake.fields = "reject"
+        self._assert_labels_with_fields(True, False)
+        self.assertFalse(self.client._supports_fields)
+        # the server isn't asked again
+        self._assert_labels_with_fields(False)
+
+    def test_fields_dropped(self):
+        """Test falling back to full terms when the server leaves out the requested fields."""
+        self.fake.fields = "drop"
+        self._assert_labels_with_fields(True, False)
+        self.assertFalse(self.client._supports_fields)
+        self._assert_labels_with_fields(False)
+
+    def test_terms_fields_fallback(self):
+        """Test compact terms fall back to full terms the same way as labels."""
+        for fields, stream in product(("project", "reject", "drop"), (False, True)):
+            with self.subTest(fields=fields, stream=stream):
+                self.fake.fields = fields
+                self.client._supports_fields = None
+                self.assertEqual(
+                    [Term(iri=term["iri"], label=term["label"]) for term in TERMS],
+                    list(self.client.iter_terms("foo", size=2, raw=False, stream=stream)),
+                )
+                self.assertEqual(fields == "project", self.client._supports_fields)
+
+
+class TestHierarchy(unittest.TestCase):
+    """Test iterating over the hierarchy without connecting to a server."""
+
+    def setUp(self) -> None:
+        """Set up the test case with a session that serves the mock terms."""
+        self.fake = FakeOLS(BASE_URL)
+        session = mock.Mock(spec=requests.Session)
+        session.get.side_effect = self.fake.get
+        self.client = Client(BASE_URL, session=session)
+
+    def _get_children_requested(self) -> List[str]:
+        return [url for url in self.fake.requested if url.endswith("/hierarchicalChildren")]
+
+    def test_iter_hierarchy(self):
+        """Test pairs are yielded in parent order and leaves aren't looked up."""
+
+        def _get(url, **kwargs):
+            # answer for the earlier terms last, so lookups finish out of order
+            if url in CHILDREN_LINKS:
+                time.sleep(0.02 * (len(CHILDREN_LINKS) - CHILDREN_LINKS.index(url)))
+            return self.fake.get(url, **kwargs)
+
+        self.client.session.get.side_effect = _get
+        expected = [
+            (parent["label"], child["label"])
+            for i, parent in enumerate(TERMS[:-1])
+            for child in TERMS[i + 1 : i + 3]
+        ]
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                self.fake.requested.clear()
+                pairs = list(self.client.iter_hierarchy("foo", size=2, workers=workers))
+                self.assertEqual(expected, pairs)
+                self.assertEqual(sorted(CHILDREN_LINKS), sorted(self._get_children_requested()))
+
+    def test_iter_hierarchy_close(self):
+        """Test closing the iterator cancels the lookups that haven't started."""
+        started, release = threading.Event(), threading.Event()
+
+        def _get(url, **kwargs):
+            if url == CHILDREN_LINKS[1]:
+                started.set()
+                release.wait(5)
+            return self.fake.get(url, **kwargs)
+
+        self.client.session.get.side_effect = _get
+        # with one worker, four lookups are queued before the first pair is yielded
+        pairs = self.client.iter_hierarchy("foo", workers=1)
+        self.assertEqual((TERMS[0]["label"], TERMS[1]["label"]), next(pairs))
+        self.assertTrue(started.wait(5))
+        threading.Timer(0.1, release.set).start()
+        pairs.close()
+        self.assertEqual(CHILDREN_LINKS[:2], self._get_children_requested())
+
+
+class TestTerms(unittest.TestCase):
+    """Test looking up terms without connecting to a server."""
+
+    def setUp(self) -> None:
+        """Set up the test case with a session that serves the mock terms and a tiny memo."""
+        self.fake = FakeOLS(BASE_URL)
+        session = mock.Mock(spec=requests.Session)
+        session.get.side_effect = self.fake.get
+        self.client = Client(BASE_URL, session=session, memo_size=1)
+
+    def test_get_terms(self):
+        """Test looking up more terms than fit in the memo concurrently."""
+        iris = [term["iri"] for term in TERMS]
+        for force in (False, True):
+            with self.subTest(force=force):
+                rv = self.client.get_terms("foo", iris, force=force, workers=4)
+                self.assertEqual(iris, list(rv))
+                self.assertEqual(
+                    iris, [value["_embedded"]["terms"][0]["iri"] for value in rv.values()]
+                )
+        self.fake.requested.clear()
+        self.client.get_terms("foo", iris[-1:])
+        self.assertEqual([], self.fake.requested, msg="the last term looked up should be memoized")
+
+
+class TestCache(ServerTestCase):
+    """Test the on-disk cache."""
+
+    def test_stream_cached(self):
+        """Test pages can be streamed again once they're read from the cache."""
+        with tempfile.TemporaryDirectory() as directory:
+            client = Client(self.base_url, cache=Path(directory, "http.sqlite"), stream=True)
+            try:
+                for _ in range(2):
+                    self.assertEqual(
+                        [term["label"] for term in TERMS],
+                        list(client.iter_labels("foo", size=2)),
+                    )
+                    self.assertEqual(TERMS, list(client.iter_terms("foo", size=2)))
+            finally:
+                client.close()
+        # the second round is only served from the cache
+        self.assertEqual(3, len(self.fake.requested))
+
+
+class TestAsync(ServerTestCase):
+    """Test the asynchronous pager."""
+
+    def setUp(self) -> None:
+        """Set up the test case with a client for the local server."""
+        super().setUp()
+        self.client = Client(self.base_url)
+        self.path = self.client._terms_url.format("foo")
+
+    def _pages(self) -> List[int]:
+        return sorted(
+            int(parse_qs(urlsplit(url).query).get("page", ["0"])[0]) for url in self.fake.requested
+        )
+
+    def test_aiter_terms(self):
+        """Test terms are yielded in page order and each page is requested once."""
+
+        async def _collect():
+            async with self.client:
+                return [
+                    term async for term in self.client.aiter_terms("foo", size=1, concurrency=2)
+                ]
+
+        self.assertEqual(TERMS, asyncio.run(_collect()))
+        self.assertEqual([0, 1, 2, 3, 4], self._pages())
+
+    def test_iter_paged_concurrent(self):
+        """Test the synchronous wrapper yields items in page order."""
+        for concurrency in (1, 3, 8):
+            with self.subTest(concurrency=concurrency):
+                self.fake.requested.clear()
+                items = self.client.iter_paged_concurrent(
+                    self.path, key="terms", size=1, concurrency=concurrency
+                )
+                self.assertEqual(TERMS, list(items))
+                self.assertEqual([0, 1, 2, 3, 4], self._pages())
+
+    def test_aget_paged_links(self):
+        """Test the links to following pages are followed when pages don't say how many there are."""
+        self.fake.page_info = False
+
+        async def _collect():
+            return [term async for term in self.client.aget_paged(self.path, key="terms", size=2)]
+
+        self.assertEqual(TERMS, asyncio.run(_collect()))
+        self.assertEqual([0, 1, 2], self._pages())
+
+    def test_close_early(self):
+        """Test closing the pager cancels the pages that are still pending instead of waiting for them."""
+        self.fake.delay = 0.5
+        futures = []
+
+        def _ensure_future(coro):
+            future = ensure_future(coro)
+            futures.append(future)
+            return future
+
+        async def _get_first():
+            items = self.client.aget_paged(self.path, key="terms", size=1, concurrency=3)
+            first = await items.__anext__()
+            start = time.time()
+            await items.aclose()
+            return first, time.time() - start
+
+        ensure_future = asyncio.ensure_future
+        with mock.patch("asyncio.ensure_future", _ensure_future):
+            first, elapsed = asyncio.run(_get_first())
+        self.assertEqual(TERMS[0], first)
+        self.assertLess(elapsed, self.fake.delay)
+        self.assertEqual(3, len(futures))
+        self.assertTrue(all(future.cancelled() for future in futures))
+
+    def test_no_unclosed_sessions(self):
+        """Test no session is left open, with or without the client as a context manager."""
+
+        async def _collect():
+            return [label async for label in self.client.aiter_labels("foo", size=2)]
+
+        async def _collect_with():
+            async with self.client:
+                return await _collect()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            for func in (_collect, _collect, _collect_with, _collect_with):
+                self.assertEqual([term["label"] for term in TERMS], asyncio.run(func()))
+            list(self.client.iter_paged_concurrent(self.path, key="terms", size=2))
+            gc.collect()
+        self.assertEqual(
+            [], [str(w.message) for w in caught if issubclass(w.category, ResourceWarning)]
+        )
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the memo shared by the client's threads."""
+
+    def test_threads(self):
+        """Test concurrent lookups and updates never see a key evicted halfway."""
+        cache = _LRUCache(1)
+
+        def _use(i: int) -> None:
+            for j in range(2000):
+                cache.set((i, j), j)
+                self.assertIn(cache.get((i, j)), (j, None))
+
+        # switch threads as often as possible to make a race likely
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with ThreadPoolExecutor(8) as executor:
+                list(executor.map(_use, range(8)))
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(1, len(cache._data))
+
+
+class TestSession(unittest.TestCase):
+    """Test sharing sessions between clients."""
+
+    def test_shared_per_server(self):
+        """Test clients only share a session with clients for the same server."""
+        client = Client(BASE_URL)
+        self.assertIs(client.session, Client(BASE_URL).session)
+        self.assertIsNot(client.session, Client("https://example.com/ols/api").session)
+
+    def test_shared_per_database(self):
+        """Test clients caching in the same database share a session however it's given."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "http.sqlite")
+            session = Client(BASE_URL, cache=path, cache_expire_after=60).session
+            for cache in (str(path), Path(directory, "http"), Path(directory, ".", "http.sqlite")):
+                with self.subTest(cache=cache):
+                    self.assertIs(
+                        session, Client(BASE_URL, cache=cache, cache_expire_after=60).session
+                    )
+            self.assertIs(
+                session,
+                Client(BASE_URL, cache=path, cache_expire_after=timedelta(seconds=60)).session,
+            )
+            self.assertIsNot(
+                session, Client(BASE_URL, cache=Path(directory, "other.sqlite")).session
+            )
+            self.assertIsNot(session, Client(BASE_URL, cache_expire_after=60).session)
+
+
+class TestQuote(unittest.TestCase):
+    """Test encoding IRIs for use in paths."""
+
+    def test_quote(self):
+        """Test IRIs are double encoded."""
+        for iri in [
+            "http://purl.obolibrary.org/obo/GO_0008150",
+            "http://biomodels.net/SBO/SBO_0000150",
+            "http://www.ebi.ac.uk/efo/EFO_0000001",
+            "http://purl.obolibrary.org/obo/go#part_of",
+            "https://example.org/a b?c=d&e=f%20g",
+            "http://example.org/ünïcödé",
+        ]:
+            with self.subTest(iri=iri):
+                self.assertEqual(quote(quote(iri, safe=""), safe=""), _quote(iri))
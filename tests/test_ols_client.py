@@ -21,3 +21,14 @@ class TestEbi(cases.TestClient):
         self.assertEqual(1, len(terms))
         term = terms[0]
         self.assertEqual(iri, term["iri"])
+
+    def test_get_terms(self):
+        """Test getting several terms at once."""
+        iris = [f"http://biomodels.net/SBO/SBO_{i:07}" for i in range(150, 160)]
+        res = self.client.get_terms("sbo", iris + iris[:2])
+        self.assertEqual(iris, list(res))
+        for iri, res_json in res.items():
+            with self.subTest(iri=iri):
+                terms = res_json["_embedded"]["terms"]
+                self.assertEqual(1, len(terms))
+                self.assertEqual(iri, terms[0]["iri"])